@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Run several file-based skill-governance hooks in one interpreter.
+
+Usage: _runner.py HOOK[,HOOK...] FILE...
+       _runner.py all FILE...
+
+Each path is classified once up front and every hook is handed only the
+files it would act on if run alone. Running them in one process pays interpreter
+startup, imports, and the _utils caches (repo root, budgets, path
+classification, token estimates) once instead of once per hook. Exits
+non-zero if any hard-tier hook fails.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from _utils import find_repo_root, classify_file, resolve_paths
+
+import check_context_load
+import check_frontmatter
+import check_isolation
+import check_prose
+import check_references
+import check_token_budget
+
+def _skill_md(filepath, cls):
+    """Non-excluded SKILL.md files, whatever their classification."""
+    return cls != "skip" and os.path.basename(filepath) == "SKILL.md"
+
+
+def _specialist(filepath, cls):
+    return cls == "specialist"
+
+
+def _budgeted(filepath, cls):
+    return cls != "skip"
+
+
+def _any(filepath, cls):
+    """check_context_load maps any file to its enclosing skill itself."""
+    return True
+
+
+# Hook name -> (module, filter on (path, classification)). Each filter keeps
+# exactly the files the hook would act on if run alone. Hard checks first,
+# then advisory checks (mirrors pre-commit-config.yaml).
+HOOKS = {
+    "check_frontmatter": (check_frontmatter, _skill_md),
+    "check_references": (check_references, _skill_md),
+    "check_isolation": (check_isolation, _specialist),
+    "check_context_load": (check_context_load, _any),
+    "check_token_budget": (check_token_budget, _budgeted),
+    "check_prose": (check_prose, _skill_md),
+}
+
+
+def classify_all(filepaths, repo_root):
+    """Classify each path once. Returns [(abs_path, classification), ...]."""
+    return [(fp, classify_file(fp, repo_root)) for fp in resolve_paths(filepaths)]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("ERROR: usage: _runner.py HOOK[,HOOK...]|all FILE...", file=sys.stderr)
+        sys.exit(1)
+
+    names = list(HOOKS) if sys.argv[1] == "all" else sys.argv[1].split(",")
+    unknown = [name for name in names if name not in HOOKS]
+    if unknown:
+        print(
+            f"ERROR: unknown hook(s): {', '.join(unknown)} "
+            f"(valid: {', '.join(HOOKS)})",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    filepaths = sys.argv[2:]
+    if not filepaths:
+        sys.exit(0)
+
+    repo_root = find_repo_root()
+    classified = classify_all(filepaths, repo_root)
+    status = 0
+    for name in names:
+        module, accepts = HOOKS[name]
+        relevant = [fp for fp, cls in classified if accepts(fp, cls)]
+        if relevant:
+            status = max(status, module.run(relevant, repo_root))
+
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ v1.3 hook logic (from soc-security-skills): shared-references support,
 flat-key budgets, override resolution, and robust classify_file.
 """
 
+import functools
 import json
 import math
 import os
@@ -13,18 +14,71 @@ import subprocess
 TOKEN_RATIO = 1.33
 DEFAULT_CEILING = 5500
 WARN_THRESHOLD = 0.90
+READ_CHUNK = 65536
+
+# Maps ASCII whitespace (the bytes.split() set) to b" " and every other byte
+# to b"x", so words can be counted as " x" transitions at C speed.
+_WORD_MARKS = bytes(0x20 if b in b" \t\n\r\x0b\x0c" else 0x78 for b in range(256))
+# Same for ASCII text, where str.split() also breaks on \x1c-\x1f.
+_TEXT_WORD_MARKS = bytes(
+    0x20 if b in b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f" else 0x78 for b in range(256)
+)
 
 
 # ---------------------------------------------------------------------------
 # Repository helpers
 # ---------------------------------------------------------------------------
 
-def find_repo_root():
-    """Find the git repository root directory.
+def _find_config_root(start):
+    """Walk up from start to the first directory containing pipeline/config/."""
+    d = os.path.abspath(start)
+    while True:
+        if os.path.isdir(os.path.join(d, "pipeline", "config")):
+            return d
+        parent = os.path.dirname(d)
+        if parent == d:
+            return None
+        d = parent
 
-    Falls back to walking up looking for pipeline/config/ if git is
-    unavailable, then to cwd as last resort.
+
+def _find_work_tree(start):
+    """Walk up from start to the first directory containing .git.
+
+    That is the directory ``git rev-parse --show-toplevel`` reports (a .git
+    file marks a worktree or submodule root just as a .git directory does).
     """
+    d = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(d, ".git")):
+            return d
+        parent = os.path.dirname(d)
+        if parent == d:
+            return None
+        d = parent
+
+
+@functools.lru_cache(maxsize=1)
+def find_repo_root():
+    """Find the repository root directory.
+
+    Tries, in order: $SKILL_GOV_ROOT (set by a wrapper that already knows
+    the root), $GIT_WORK_TREE, walking up from cwd to the enclosing git work
+    tree and taking it if it has pipeline/config/ (pre-commit runs hooks
+    from the repo root, so this usually costs two stats and no fork),
+    ``git rev-parse``, walking up from this script, then cwd as last resort.
+    The result is cached for the lifetime of the process.
+    """
+    for var in ("SKILL_GOV_ROOT", "GIT_WORK_TREE"):
+        env_root = os.environ.get(var)
+        if env_root and os.path.isdir(os.path.join(env_root, "pipeline", "config")):
+            return os.path.abspath(env_root)
+
+    # Stop at the work tree: a pipeline/config/ above it belongs to some
+    # other checkout, and one below it is not the root git reports
+    root = _find_work_tree(os.getcwd())
+    if root and os.path.isdir(os.path.join(root, "pipeline", "config")):
+        return root
+
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
@@ -35,38 +89,54 @@ def find_repo_root():
         pass
 
     # Fallback: walk up from this script looking for pipeline/config/
-    d = os.path.dirname(os.path.abspath(__file__))
-    while True:
-        if os.path.isdir(os.path.join(d, "pipeline", "config")):
-            return d
-        parent = os.path.dirname(d)
-        if parent == d:
-            break
-        d = parent
+    return _find_config_root(os.path.dirname(os.path.abspath(__file__))) or os.getcwd()
+
 
-    return os.getcwd()
+def resolve_paths(filepaths):
+    """Return absolute, normalized paths, calling os.getcwd() once for the batch."""
+    cwd = os.getcwd()
+    return [
+        os.path.normpath(fp if os.path.isabs(fp) else os.path.join(cwd, fp))
+        for fp in filepaths
+    ]
 
 
 def load_budgets(repo_root=None):
-    """Load budget configuration from pipeline/config/budgets.json."""
+    """Load budget configuration from pipeline/config/budgets.json.
+
+    The parsed config is cached per repo root; callers must treat the
+    returned dict as read-only.
+    """
     if repo_root is None:
         repo_root = find_repo_root()
+    return _read_budgets(repo_root)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_budgets(repo_root):
     config_path = os.path.join(repo_root, "pipeline", "config", "budgets.json")
     with open(config_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+EXCLUDED_DIRS = frozenset({"pipeline", "eval-cases", "node_modules", ".github", "templates"})
+
+
+@functools.lru_cache(maxsize=4096)
+def _path_info(filepath, repo_root):
+    """Return (rel_path, parts, basename, excluded) for a file under repo_root."""
+    rel_path = os.path.relpath(filepath, repo_root).replace("\\", "/")
+    parts = tuple(rel_path.split("/"))
+    basename = os.path.basename(filepath)
+    excluded = not EXCLUDED_DIRS.isdisjoint(parts)
+    return rel_path, parts, basename, excluded
+
+
 def is_excluded(filepath, repo_root=None):
     """Check if a filepath is in an excluded directory."""
     if repo_root is None:
         repo_root = find_repo_root()
-    rel_path = os.path.relpath(filepath, repo_root)
-    parts = rel_path.replace("\\", "/").split("/")
-    excluded_dirs = {"pipeline", "eval-cases", "node_modules", ".github", "templates"}
-    for part in parts:
-        if part in excluded_dirs:
-            return True
-    return False
+    return _path_info(filepath, repo_root)[3]
 
 
 # ---------------------------------------------------------------------------
@@ -82,13 +152,15 @@ def classify_file(filepath, repo_root=None):
     """
     if repo_root is None:
         repo_root = find_repo_root()
+    return _classify(filepath, repo_root)
 
-    rel_path = os.path.relpath(filepath, repo_root).replace("\\", "/")
-    parts = rel_path.split("/")
-    basename = os.path.basename(filepath)
+
+@functools.lru_cache(maxsize=4096)
+def _classify(filepath, repo_root):
+    _, parts, basename, excluded = _path_info(filepath, repo_root)
 
     # Excluded paths
-    if is_excluded(filepath, repo_root):
+    if excluded:
         return "skip"
 
     # Reference files: references/*.md or shared-references/**/*.md
@@ -118,21 +190,34 @@ def classify_file(filepath, repo_root=None):
 # Word / token counting
 # ---------------------------------------------------------------------------
 
-def count_body_words(filepath):
-    """Count words in a markdown file, excluding YAML frontmatter."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-    except (OSError, UnicodeDecodeError):
-        return 0
+def count_text_words(text):
+    """Count words in decoded text, equal to len(text.split()) but list-free."""
+    if text.isascii():
+        marks = text.encode("ascii").translate(_TEXT_WORD_MARKS)
+        return marks.count(b" x") + marks.startswith(b"x")
+    return len(text.split())
 
-    # Strip YAML frontmatter
-    if content.startswith("---"):
-        end = content.find("---", 3)
-        if end != -1:
-            content = content[end + 3:]
 
-    return len(content.split())
+def count_file_words(filepath):
+    """Count words in a file, streaming it in READ_CHUNK-sized blocks.
+
+    Peak memory is one block rather than the whole file. A word split across
+    two blocks is counted once. Raises OSError.
+    """
+    with open(filepath, "rb") as f:
+        chunk = f.read(READ_CHUNK)
+
+        words = 0
+        in_word = False
+        while chunk:
+            marks = chunk.translate(_WORD_MARKS)
+            words += marks.count(b" x")
+            if marks.startswith(b"x") and not in_word:
+                words += 1
+            in_word = marks.endswith(b"x")
+            chunk = f.read(READ_CHUNK)
+
+    return words
 
 
 def estimate_tokens(word_count_or_filepath):
@@ -146,20 +231,42 @@ def estimate_tokens(word_count_or_filepath):
         return int(math.ceil(word_count_or_filepath * TOKEN_RATIO))
 
     # Treat as filepath
-    filepath = word_count_or_filepath
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            text = f.read()
-    except (OSError, UnicodeDecodeError):
+        word_count = count_file_words(word_count_or_filepath)
+    except OSError:
         return 0
-    word_count = len(text.split())
     return int(math.ceil(word_count * TOKEN_RATIO))
 
 
+def cached_estimate_tokens(filepath):
+    """Like estimate_tokens(filepath), memoized on the file's identity.
+
+    The cache key includes mtime and size so an edited file is re-read.
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return 0
+    return _estimate_tokens_for(os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _estimate_tokens_for(abs_path, mtime_ns, size):
+    return estimate_tokens(abs_path)
+
+
 # ---------------------------------------------------------------------------
 # Budget limits (flat-key format with override support)
 # ---------------------------------------------------------------------------
 
+_BUDGET_KEYS = {
+    "coordinator": ("coordinator_max_words", "coordinator_max_tokens"),
+    "specialist": ("specialist_max_words", "specialist_max_tokens"),
+    "standalone": ("standalone_max_words", "standalone_max_tokens"),
+    "reference": ("reference_max_words", "reference_max_tokens"),
+}
+
+
 def get_budget_for_type(file_type, budgets=None):
     """Get (max_words, max_tokens) for a file classification type.
 
@@ -168,17 +275,11 @@ def get_budget_for_type(file_type, budgets=None):
     if budgets is None:
         budgets = load_budgets()
 
-    budget_map = {
-        "coordinator": ("coordinator_max_words", "coordinator_max_tokens"),
-        "specialist": ("specialist_max_words", "specialist_max_tokens"),
-        "standalone": ("standalone_max_words", "standalone_max_tokens"),
-        "reference": ("reference_max_words", "reference_max_tokens"),
-    }
-
-    if file_type not in budget_map:
+    keys = _BUDGET_KEYS.get(file_type)
+    if keys is None:
         return None, None
 
-    words_key, tokens_key = budget_map[file_type]
+    words_key, tokens_key = keys
     return budgets.get(words_key), budgets.get(tokens_key)
 
 
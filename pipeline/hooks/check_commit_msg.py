@@ -23,9 +23,11 @@ VALID_TYPES = {
     "revert",
 }
 
+_VALID_TYPES_STR = ", ".join(sorted(VALID_TYPES))
+
 # type(scope): description  OR  type: description
 COMMIT_RE = re.compile(
-    r"^(?P<type>[a-z][a-z-]*)(?:\([^)]+\))?:\s+(?P<desc>.+)$"
+    r"(?P<type>[a-z][a-z-]*)(?:\([^)]+\))?:\s+(?P<desc>.+)"
 )
 
 MIN_DESCRIPTION_LENGTH = 10
@@ -46,13 +48,13 @@ def validate_message(message):
     if subject.startswith("Merge "):
         return True, []
 
-    match = COMMIT_RE.match(subject)
+    match = COMMIT_RE.fullmatch(subject)
     if not match:
         errors.append(
             f"commit message must match 'type(scope): description' "
             f"or 'type: description'\n"
             f"  Got: {subject}\n"
-            f"  Valid types: {', '.join(sorted(VALID_TYPES))}"
+            f"  Valid types: {_VALID_TYPES_STR}"
         )
         return False, errors
 
@@ -62,7 +64,7 @@ def validate_message(message):
     if commit_type not in VALID_TYPES:
         errors.append(
             f"unknown commit type '{commit_type}'\n"
-            f"  Valid types: {', '.join(sorted(VALID_TYPES))}"
+            f"  Valid types: {_VALID_TYPES_STR}"
         )
 
     if len(description) < MIN_DESCRIPTION_LENGTH:
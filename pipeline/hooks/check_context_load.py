@@ -3,10 +3,12 @@
 
 import os
 import sys
+from functools import lru_cache
 
 sys.path.insert(0, os.path.dirname(__file__))
 from _utils import (
-    find_repo_root, load_budgets, estimate_tokens, get_context_ceiling,
+    find_repo_root, resolve_paths, load_budgets, cached_estimate_tokens,
+    get_context_ceiling,
 )
 
 
@@ -15,11 +17,35 @@ def get_reference_files(skill_dir):
     refs_dir = os.path.join(skill_dir, "references")
     if not os.path.isdir(refs_dir):
         return []
-    result = []
-    for entry in os.listdir(refs_dir):
-        if entry.endswith(".md"):
-            result.append(os.path.join(refs_dir, entry))
-    return result
+    with os.scandir(refs_dir) as it:
+        return [e.path for e in it if e.name.endswith(".md") and e.is_file()]
+
+
+@lru_cache(maxsize=None)
+def _enclosing_skill_dir(d, repo_root):
+    """Nearest directory from d up (repo_root excluded) holding a SKILL.md.
+
+    Memoized, so each directory is probed at most once per process however
+    many changed files sit below it.
+    """
+    if d == repo_root or d == os.path.dirname(d):
+        return None
+    if os.path.isfile(os.path.join(d, "SKILL.md")):
+        return d
+    return _enclosing_skill_dir(os.path.dirname(d), repo_root)
+
+
+def find_skill_dir(filepath, repo_root):
+    """Map a changed file to the skill directory whose context load it affects.
+
+    A SKILL.md maps to its own directory without touching the filesystem;
+    any other file maps to the nearest enclosing directory with a SKILL.md.
+    Returns None when there is none below repo_root.
+    """
+    d = os.path.dirname(filepath)
+    if os.path.basename(filepath) == "SKILL.md":
+        return d
+    return _enclosing_skill_dir(d, repo_root)
 
 
 def check_suite(suite_dir, repo_root, budgets):
@@ -34,41 +60,53 @@ def check_suite(suite_dir, repo_root, budgets):
     if not os.path.isfile(coordinator_path):
         return []
 
-    coord_tokens = estimate_tokens(coordinator_path)
+    coord_tokens = cached_estimate_tokens(coordinator_path)
     skills_dir = os.path.join(suite_dir, "skills")
     errors = []
 
     if not os.path.isdir(skills_dir):
         return []
 
-    for entry in sorted(os.listdir(skills_dir)):
-        spec_dir = os.path.join(skills_dir, entry)
+    with os.scandir(skills_dir) as it:
+        spec_entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+
+    for spec_entry in spec_entries:
+        entry = spec_entry.name
+        spec_dir = spec_entry.path
         spec_skill = os.path.join(spec_dir, "SKILL.md")
         if not os.path.isfile(spec_skill):
             continue
 
-        spec_tokens = estimate_tokens(spec_skill)
+        spec_tokens = cached_estimate_tokens(spec_skill)
+        rel_spec = os.path.relpath(spec_dir, repo_root)
+        max_tokens = get_context_ceiling(rel_spec, repo_root, budgets)
 
-        # Find largest reference for THIS specialist only
+        # Find largest reference for THIS specialist only -- unless the
+        # coordinator and specialist alone already exceed the ceiling, in
+        # which case the references cannot change the verdict.
         max_ref_tokens = 0
         max_ref_name = ""
-        for ref_path in get_reference_files(spec_dir):
-            tokens = estimate_tokens(ref_path)
-            if tokens > max_ref_tokens:
-                max_ref_tokens = tokens
-                max_ref_name = os.path.relpath(ref_path, repo_root)
+        refs_skipped = coord_tokens + spec_tokens > max_tokens
+        if not refs_skipped:
+            for ref_path in get_reference_files(spec_dir):
+                tokens = cached_estimate_tokens(ref_path)
+                if tokens > max_ref_tokens:
+                    max_ref_tokens = tokens
+                    max_ref_name = os.path.relpath(ref_path, repo_root)
 
         total = coord_tokens + spec_tokens + max_ref_tokens
-        rel_spec = os.path.relpath(spec_dir, repo_root)
-        max_tokens = get_context_ceiling(rel_spec, repo_root, budgets)
 
         if total > max_tokens:
             detail = f"coordinator={coord_tokens}"
             detail += f" + specialist({entry})={spec_tokens}"
             if max_ref_tokens > 0:
                 detail += f" + reference({max_ref_name})={max_ref_tokens}"
+            elif refs_skipped:
+                detail += " + references (not counted)"
+            # Skipped references would only add to the load
+            load = f"at least {total}" if refs_skipped else str(total)
             errors.append(
-                f"{rel_spec}: context load {total} tokens exceeds "
+                f"{rel_spec}: context load {load} tokens exceeds "
                 f"ceiling of {max_tokens} ({detail}). "
                 f"Reduce the specialist or split the largest reference file."
             )
@@ -76,46 +114,37 @@ def check_suite(suite_dir, repo_root, budgets):
     return errors
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
-
-    repo_root = find_repo_root()
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
     budgets = load_budgets(repo_root)
 
-    # Collect unique skill directories from passed files
-    checked = set()
+    # Map each passed file to its skill directory; is_suite caches whether
+    # that directory is a suite (has a skills/ subdirectory)
+    is_suite = {}
     all_errors = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
-
-        # Walk up to find the skill directory (one containing SKILL.md)
-        d = os.path.dirname(filepath)
-        skill_dir = None
-
-        if os.path.basename(filepath) == "SKILL.md":
-            skill_dir = d
-        else:
-            candidate = d
-            while candidate != repo_root and candidate != os.path.dirname(candidate):
-                if os.path.isfile(os.path.join(candidate, "SKILL.md")):
-                    skill_dir = candidate
-                    break
-                candidate = os.path.dirname(candidate)
+    for filepath in resolve_paths(filepaths):
+        skill_dir = find_skill_dir(filepath, repo_root)
 
-        if skill_dir is None or skill_dir in checked:
+        if skill_dir is None or skill_dir in is_suite:
             continue
-        checked.add(skill_dir)
+        is_suite[skill_dir] = os.path.isdir(os.path.join(skill_dir, "skills"))
 
         # Only check suites (directory with SKILL.md + skills/ subdirectory)
-        if os.path.isdir(os.path.join(skill_dir, "skills")):
+        if is_suite[skill_dir]:
             all_errors.extend(check_suite(skill_dir, repo_root, budgets))
 
     for e in all_errors:
         print(f"FAIL: {e}", file=sys.stderr)
 
-    sys.exit(1 if all_errors else 0)
+    return 1 if all_errors else 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
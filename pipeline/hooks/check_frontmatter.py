@@ -6,13 +6,12 @@ import re
 import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _utils import find_repo_root, is_excluded
+from _utils import find_repo_root, resolve_paths, is_excluded
 
-try:
-    import yaml
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
+# PyYAML is imported on first use (see _have_yaml) so commits that touch no
+# SKILL.md never pay for loading it.
+yaml = None
+HAS_YAML = None
 
 REQUIRED_FIELDS = {"name", "description"}
 VALID_OPTIONAL = {"model", "version", "config", "hooks", "depends_on", "distribution"}
@@ -20,28 +19,48 @@ VALID_MODEL_PREFERRED = {"haiku", "sonnet", "opus"}
 VALID_MODEL_REASONING = {"low", "medium", "high"}
 VALID_DISTRIBUTION = {"repo", "marketplace"}
 VALID_HOOK_EVENTS = {"PreToolUse", "PostToolUse"}
-KEBAB_RE = re.compile(r"^[a-z][a-z0-9]*(-[a-z0-9]+)*$")
+KEBAB_RE = re.compile(r"[a-z][a-z0-9]*(-[a-z0-9]+)*")
 MIN_DESCRIPTION_WORDS = 10
 
+# Pre-rendered for error messages
+_VALID_MODEL_PREFERRED_STR = str(sorted(VALID_MODEL_PREFERRED))
+_VALID_MODEL_REASONING_STR = str(sorted(VALID_MODEL_REASONING))
+_VALID_DISTRIBUTION_STR = str(sorted(VALID_DISTRIBUTION))
+_VALID_HOOK_EVENTS_STR = str(sorted(VALID_HOOK_EVENTS))
+# KEBAB_RE is applied with fullmatch; show the anchored form
+_KEBAB_PATTERN_STR = f"^{KEBAB_RE.pattern}$"
+# A line consisting of --- (surrounding whitespace allowed) closes frontmatter
+FRONTMATTER_END_RE = re.compile(r"^[^\S\n]*---[^\S\n]*$", re.MULTILINE)
+
+
+def _have_yaml():
+    """Import PyYAML on first call. Returns True if it is available."""
+    global yaml, HAS_YAML
+    if HAS_YAML is None:
+        try:
+            import yaml as _yaml
+            yaml = _yaml
+            HAS_YAML = True
+        except ImportError:
+            HAS_YAML = False
+    return HAS_YAML
+
 
 def extract_frontmatter(text):
     """Extract YAML frontmatter between --- markers. Returns (dict, error_msg)."""
-    lines = text.split("\n")
-    if not lines or lines[0].strip() != "---":
+    first_nl = text.find("\n")
+    first_line = text if first_nl == -1 else text[:first_nl]
+    if first_line.strip() != "---":
         return None, "no frontmatter found (file must start with ---)"
 
-    end_idx = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_idx = i
-            break
-
-    if end_idx is None:
+    # Only scan as far as the closing marker; the body is never split
+    end = None if first_nl == -1 else FRONTMATTER_END_RE.search(text, first_nl + 1)
+    if end is None:
         return None, "no closing --- found for frontmatter"
 
-    yaml_text = "\n".join(lines[1:end_idx])
+    yaml_text = text[first_nl + 1:max(first_nl + 1, end.start() - 1)]
 
-    if HAS_YAML:
+    if _have_yaml():
         try:
             data = yaml.safe_load(yaml_text)
         except Exception as e:
@@ -97,10 +116,10 @@ def check_file(filepath, repo_root):
     # Validate name format
     if "name" in data and data["name"]:
         name = str(data["name"])
-        if not KEBAB_RE.match(name):
+        if not KEBAB_RE.fullmatch(name):
             errors.append(
                 f"{rel_path}: 'name' must be kebab-case "
-                f"(got '{name}', expected pattern: {KEBAB_RE.pattern})"
+                f"(got '{name}', expected pattern: {_KEBAB_PATTERN_STR})"
             )
 
     # Validate description length
@@ -119,17 +138,17 @@ def check_file(filepath, repo_root):
         if "preferred" in model and model["preferred"] not in VALID_MODEL_PREFERRED:
             errors.append(
                 f"{rel_path}: 'model.preferred' must be one of "
-                f"{sorted(VALID_MODEL_PREFERRED)} (got '{model['preferred']}')"
+                f"{_VALID_MODEL_PREFERRED_STR} (got '{model['preferred']}')"
             )
         if "minimum" in model and model["minimum"] not in VALID_MODEL_PREFERRED:
             errors.append(
                 f"{rel_path}: 'model.minimum' must be one of "
-                f"{sorted(VALID_MODEL_PREFERRED)} (got '{model['minimum']}')"
+                f"{_VALID_MODEL_PREFERRED_STR} (got '{model['minimum']}')"
             )
         if "reasoning_demand" in model and model["reasoning_demand"] not in VALID_MODEL_REASONING:
             errors.append(
                 f"{rel_path}: 'model.reasoning_demand' must be one of "
-                f"{sorted(VALID_MODEL_REASONING)} (got '{model['reasoning_demand']}')"
+                f"{_VALID_MODEL_REASONING_STR} (got '{model['reasoning_demand']}')"
             )
 
     # Validate config block if present (Warn tier)
@@ -160,7 +179,7 @@ def check_file(filepath, repo_root):
                     if "event" in hook and hook["event"] not in VALID_HOOK_EVENTS:
                         warnings.append(
                             f"{rel_path}: 'hooks[{i}].event' must be one of "
-                            f"{sorted(VALID_HOOK_EVENTS)} (got '{hook['event']}')"
+                            f"{_VALID_HOOK_EVENTS_STR} (got '{hook['event']}')"
                         )
 
     # Validate depends_on if present (Info tier)
@@ -170,7 +189,7 @@ def check_file(filepath, repo_root):
             warnings.append(f"{rel_path}: 'depends_on' must be a list of kebab-case skill names")
         else:
             for dep in deps:
-                if not isinstance(dep, str) or not KEBAB_RE.match(dep):
+                if not isinstance(dep, str) or not KEBAB_RE.fullmatch(dep):
                     warnings.append(f"{rel_path}: 'depends_on' entry '{dep}' must be kebab-case")
 
     # Validate distribution if present (Info tier)
@@ -179,7 +198,7 @@ def check_file(filepath, repo_root):
         if dist not in VALID_DISTRIBUTION:
             warnings.append(
                 f"{rel_path}: 'distribution' must be one of "
-                f"{sorted(VALID_DISTRIBUTION)} (got '{dist}')"
+                f"{_VALID_DISTRIBUTION_STR} (got '{dist}')"
             )
 
     # Warn on unknown top-level fields
@@ -191,16 +210,16 @@ def check_file(filepath, repo_root):
     return errors, warnings
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
+    filepaths = [fp for fp in filepaths if os.path.basename(fp) == "SKILL.md"]
+    if not filepaths:
+        return 0
 
-    repo_root = find_repo_root()
     all_errors = []
     all_warnings = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
+    for filepath in resolve_paths(filepaths):
         errors, warnings = check_file(filepath, repo_root)
         all_errors.extend(errors)
         all_warnings.extend(warnings)
@@ -211,7 +230,14 @@ def main():
     for e in all_errors:
         print(f"FAIL: {e}", file=sys.stderr)
 
-    sys.exit(1 if all_errors else 0)
+    return 1 if all_errors else 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
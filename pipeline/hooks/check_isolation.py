@@ -6,36 +6,33 @@ import re
 import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _utils import find_repo_root, classify_file, is_excluded
+from _utils import find_repo_root, resolve_paths, classify_file, is_excluded
 
 
 def find_sibling_specialists(filepath, repo_root):
     """Find sibling specialist directories for a specialist skill."""
-    parts = filepath.replace("\\", "/").split("/")
+    parts = os.path.relpath(filepath, repo_root).replace("\\", "/").split("/")
 
-    # Find the "skills" component in the path
-    skills_idx = None
-    for i, part in enumerate(parts):
-        if part == "skills":
-            skills_idx = i
-            break
-
-    if skills_idx is None:
+    # Find the "skills" component in the repo-relative path
+    try:
+        skills_idx = parts.index("skills")
+    except ValueError:
         return set(), None
 
-    # The specialist name is the directory right after skills/
-    if skills_idx + 1 >= len(parts) - 1:
+    # The specialist name is the directory right after skills/; the file
+    # itself must sit below it (skills/<name>/SKILL.md at minimum)
+    if skills_idx + 2 >= len(parts):
         return set(), None
 
     specialist_name = parts[skills_idx + 1]
-    skills_parent = "/".join(parts[:skills_idx + 1])
+    skills_parent = os.path.join(repo_root, *parts[:skills_idx + 1])
 
     siblings = set()
     try:
-        for entry in os.listdir(skills_parent):
-            entry_path = os.path.join(skills_parent, entry)
-            if os.path.isdir(entry_path) and entry != specialist_name:
-                siblings.add(entry)
+        with os.scandir(skills_parent) as it:
+            for entry in it:
+                if entry.name != specialist_name and entry.is_dir():
+                    siblings.add(entry.name)
     except OSError:
         return set(), specialist_name
 
@@ -65,58 +62,46 @@ def check_file(filepath, repo_root):
 
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+            lines = f.read().split("\n")
     except (OSError, UnicodeDecodeError) as e:
         errors.append(f"{rel_path}: could not read file: {e}")
         return errors, warnings
 
-    # Build patterns to detect cross-references
+    # One alternation over all siblings (longest first so a sibling whose
+    # name prefixes another cannot shadow it). Matches path references like
+    # ../sibling/SKILL.md, ../sibling.md, sibling/references/, skills/sibling/.
+    # File path references are blocked (isolation rule).
+    # Name-only composition references are allowed (§2.6).
+    sib_alt = "|".join(re.escape(s) for s in sorted(siblings, key=len, reverse=True))
+    sibling_re = re.compile(
+        rf"\.\./?(?P<rel>{sib_alt})(?:/|\.md)"
+        rf"|(?P<path>{sib_alt})/(?:SKILL\.md|references/)"
+        rf"|skills/(?P<skills>{sib_alt})/"
+    )
+
     for line_num, line in enumerate(lines, start=1):
-        for sibling in siblings:
-            # Match patterns like ../sibling-name/SKILL.md or ../sibling-name/references/
-            pattern = re.compile(
-                r"\.\./?" + re.escape(sibling) + r"(/|\.md|/SKILL\.md|/references/)"
+        reported = set()
+        for match in sibling_re.finditer(line):
+            sibling = match.group(match.lastgroup)
+            if sibling in reported:
+                continue
+            reported.add(sibling)
+            errors.append(
+                f"{rel_path}:{line_num}: cross-reference to sibling "
+                f"specialist '{sibling}' violates isolation rule "
+                f"(source: {specialist_name}, target: {sibling}). "
+                f"Use handoff protocol instead."
             )
-            # Also match skills/sibling-name references
-            # File path references are blocked (isolation rule).
-            # Name-only composition references are allowed (§2.6).
-            alt_patterns = [
-                f"{sibling}/SKILL.md",
-                f"{sibling}/references/",
-                f"skills/{sibling}/",
-                f"skills/{sibling}/SKILL.md",
-            ]
-            if pattern.search(line):
-                errors.append(
-                    f"{rel_path}:{line_num}: cross-reference to sibling "
-                    f"specialist '{sibling}' violates isolation rule "
-                    f"(source: {specialist_name}, target: {sibling}). "
-                    f"Use handoff protocol instead."
-                )
-            else:
-                for alt in alt_patterns:
-                    if alt in line:
-                        errors.append(
-                            f"{rel_path}:{line_num}: cross-reference to sibling "
-                            f"specialist '{sibling}' violates isolation rule "
-                            f"(source: {specialist_name}, target: {sibling}). "
-                            f"Use handoff protocol instead."
-                        )
-                        break
 
     return errors, warnings
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
-
-    repo_root = find_repo_root()
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
     all_errors = []
     all_warnings = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
+    for filepath in resolve_paths(filepaths):
         errors, warnings = check_file(filepath, repo_root)
         all_errors.extend(errors)
         all_warnings.extend(warnings)
@@ -127,7 +112,14 @@ def main():
     for e in all_errors:
         print(f"FAIL: {e}", file=sys.stderr)
 
-    sys.exit(1 if all_errors else 0)
+    return 1 if all_errors else 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
@@ -4,9 +4,11 @@
 import os
 import re
 import sys
+from bisect import bisect_right
+from itertools import accumulate
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _utils import find_repo_root, is_excluded
+from _utils import find_repo_root, resolve_paths, is_excluded
 
 PROHIBITED_PATTERNS = [
     (r"it is important to", "state the action directly"),
@@ -30,6 +32,23 @@ PROHIBITED_PATTERNS = [
     (r"don't hesitate to", "use imperative"),
 ]
 
+# All patterns fused into one alternation, compiled once; the named group
+# p<i> identifies which PROHIBITED_PATTERNS entry matched. The leading
+# lookahead on the set of first letters rejects most positions with one
+# class test instead of trying every branch. The alternation itself sits in
+# a lookahead too, so every start position is tried and a match never hides
+# an overlapping one ("the reason for this is because").
+_FIRST_CHARS = "".join(sorted({pat[0] for pat, _ in PROHIBITED_PATTERNS}))
+PROHIBITED_RE = re.compile(
+    f"(?=[{_FIRST_CHARS}])(?=(?:"
+    + "|".join(f"(?P<p{i}>{pat})" for i, (pat, _) in enumerate(PROHIBITED_PATTERNS))
+    + "))",
+    re.IGNORECASE,
+)
+
+# Level-2 heading line (leading whitespace allowed); group 1 is the title
+HEADING_RE = re.compile(r"^[^\S\n]*##[^\S\n]+(\S.*)$", re.MULTILINE)
+
 # Sections to exclude from checking (non-procedure content where prose is acceptable)
 EXCLUDED_SECTIONS = {"purpose", "context", "background", "notes", "description",
                      "overview", "when to use", "don't use"}
@@ -41,20 +60,25 @@ def find_procedure_sections(text):
     Returns (lines_list, [(start, end), ...]).
     """
     lines = text.split("\n")
+    if "procedure" not in text.lower():
+        return lines, []
+
     ranges = []
     in_procedure = False
     start = None
-
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if re.match(r"^##\s+", stripped):
-            section_name = re.sub(r"^##\s+", "", stripped).strip().lower()
-            if in_procedure:
-                ranges.append((start, i))
-                in_procedure = False
-            if "procedure" in section_name and section_name not in EXCLUDED_SECTIONS:
-                in_procedure = True
-                start = i + 1  # start after the heading line
+    line_idx = 0
+    pos = 0
+
+    for match in HEADING_RE.finditer(text):
+        line_idx += text.count("\n", pos, match.start())
+        pos = match.start()
+        section_name = match.group(1).strip().lower()
+        if in_procedure:
+            ranges.append((start, line_idx))
+            in_procedure = False
+        if "procedure" in section_name and section_name not in EXCLUDED_SECTIONS:
+            in_procedure = True
+            start = line_idx + 1  # start after the heading line
 
     if in_procedure:
         ranges.append((start, len(lines)))
@@ -85,30 +109,36 @@ def check_file(filepath, repo_root):
     if not ranges:
         return warnings
 
-    compiled = [(p, re.compile(p, re.IGNORECASE), s) for p, s in PROHIBITED_PATTERNS]
+    # Offset of the first character of each line, plus one past the end
+    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
 
+    # Scan each procedure section in one pass; no pattern spans a newline,
+    # so a match's line is the last line start at or before it. One warning
+    # per pattern per line, ordered by line then PROHIBITED_PATTERNS order.
+    hits = set()
     for start, end in ranges:
-        for line_idx in range(start, min(end, len(lines))):
-            line = lines[line_idx]
-            for pattern_str, pattern_re, suggestion in compiled:
-                if pattern_re.search(line):
-                    warnings.append(
-                        f"{rel_path}:{line_idx + 1}: prohibited prose "
-                        f"pattern '{pattern_str}' found -> {suggestion}"
-                    )
+        end = min(end, len(lines))
+        if start >= end:
+            continue
+        for m in PROHIBITED_RE.finditer(text, line_starts[start], line_starts[end]):
+            line_idx = bisect_right(line_starts, m.start()) - 1
+            hits.add((line_idx, int(m.lastgroup[1:])))
+
+    for line_idx, i in sorted(hits):
+        pattern_str, suggestion = PROHIBITED_PATTERNS[i]
+        warnings.append(
+            f"{rel_path}:{line_idx + 1}: prohibited prose "
+            f"pattern '{pattern_str}' found -> {suggestion}"
+        )
 
     return warnings
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
-
-    repo_root = find_repo_root()
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
     all_warnings = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
+    for filepath in resolve_paths(filepaths):
         warnings = check_file(filepath, repo_root)
         all_warnings.extend(warnings)
 
@@ -116,7 +146,14 @@ def main():
         print(f"WARNING: {w}", file=sys.stderr)
 
     # Advisory only -- always exit 0
-    sys.exit(0)
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
@@ -4,66 +4,122 @@
 import os
 import re
 import sys
+from bisect import bisect_right
+from functools import lru_cache
 
 sys.path.insert(0, os.path.dirname(__file__))
-from _utils import find_repo_root, is_excluded
+from _utils import find_repo_root, resolve_paths, is_excluded
 
 # Patterns to match file references in SKILL.md:
 # 1. Backtick-wrapped paths: `references/foo.md`, `path/to/dir/`
 # 2. Table rows with file paths: | references/foo.md | or | `references/foo.md` |
 # 3. Bare paths starting with known prefixes
-BACKTICK_PATH_RE = re.compile(r"`([^`]+(?:\.md|/))`")
-TABLE_PATH_RE = re.compile(r"\|\s*`?([^|`\s]+(?:\.md|/))`?\s*\|")
-BARE_PATH_RE = re.compile(r"(?:^|\s)((?:references|shared-references)/[^\s)>\]]+(?:\.md|/))")
+# Each is scanned once over the whole text rather than per line. Character
+# classes exclude newlines, so no match spans a line and each scan consumes
+# exactly what it would line by line; every variable run stops at the next
+# delimiter, so matching stays linear in the text.
+BACKTICK_PATH_RE = re.compile(r"`([^`\n]+(?:\.md|/))`")
+TABLE_PATH_RE = re.compile(r"\|[^\S\n]*`?([^|`\s]+(?:\.md|/))`?[^\S\n]*\|")
+BARE_PATH_RE = re.compile(
+    r"(?:^|\s)((?:references|shared-references)/[^\s)>\]]+(?:\.md|/))", re.MULTILINE
+)
+# (pattern, needs the path heuristic), in per-line reporting order
+REFERENCE_SCANS = (
+    (BACKTICK_PATH_RE, True),
+    (TABLE_PATH_RE, True),
+    (BARE_PATH_RE, False),
+)
+# The table scan consumes each closing pipe, so in "| a.md | b.md |" the
+# second cell is never seen. This lookahead variant tries every pipe; the
+# cells only it finds are checked at WARN tier until they are enforced.
+TABLE_CELL_RE = re.compile(r"(?=\|[^\S\n]*`?([^|`\s]+(?:\.md|/))`?[^\S\n]*\|)")
+NEWLINE_RE = re.compile(r"\n")
 
 
 def find_references(text):
     """Find all file path references in text. Returns list of (line_num, path)."""
-    refs = []
-    seen = set()
+    line_starts = [0]
+    line_starts.extend(m.end() for m in NEWLINE_RE.finditer(text))
 
-    for line_num, line in enumerate(text.split("\n"), start=1):
-        # Backtick-wrapped paths
-        for match in BACKTICK_PATH_RE.finditer(line):
-            path = match.group(1)
-            if _looks_like_file_path(path):
-                key = (line_num, path)
-                if key not in seen:
-                    seen.add(key)
-                    refs.append((line_num, path))
-
-        # Table entries
-        for match in TABLE_PATH_RE.finditer(line):
-            path = match.group(1)
-            if _looks_like_file_path(path):
-                key = (line_num, path)
-                if key not in seen:
-                    seen.add(key)
-                    refs.append((line_num, path))
-
-        # Bare paths starting with references/ or shared-references/
-        for match in BARE_PATH_RE.finditer(line):
+    found = []
+    for kind, (pattern, heuristic) in enumerate(REFERENCE_SCANS):
+        for match in pattern.finditer(text):
             path = match.group(1)
-            key = (line_num, path)
-            if key not in seen:
-                seen.add(key)
-                refs.append((line_num, path))
+            if heuristic and not _looks_like_file_path(path):
+                continue
+            start = match.start(1)
+            found.append((bisect_right(line_starts, start), kind, start, path))
+
+    # Report per line: backtick, then table, then bare paths, each in order
+    found.sort()
+    refs = []
+    seen = set()
+    for line_num, _, _, path in found:
+        key = (line_num, path)
+        if key not in seen:
+            seen.add(key)
+            refs.append(key)
 
     return refs
 
 
+def find_table_cell_references(text, refs):
+    """Find table-cell paths that find_references skips. Returns list of (line_num, path)."""
+    known = set(refs)
+    extra = []
+    line_starts = None
+    for match in TABLE_CELL_RE.finditer(text):
+        path = match.group(1)
+        if not _looks_like_file_path(path):
+            continue
+        if line_starts is None:
+            line_starts = [0]
+            line_starts.extend(m.end() for m in NEWLINE_RE.finditer(text))
+        key = (bisect_right(line_starts, match.start(1)), path)
+        if key not in known:
+            known.add(key)
+            extra.append(key)
+    return extra
+
+
 def _looks_like_file_path(s):
     """Heuristic: does this string look like a relative file path?"""
-    # Must contain a / (directory separator)
-    if "/" not in s:
+    # Must contain a / (directory separator); spaces mean prose, not a path
+    if "/" not in s or " " in s:
         return False
     # Filter out URLs
-    if s.startswith("http://") or s.startswith("https://"):
-        return False
-    # Filter out things that are clearly not paths
-    if " " in s:
-        return False
-    return True
+    return not s.startswith(("http://", "https://"))
+
+
+@lru_cache(maxsize=None)
+def _exists(path):
+    """os.path.exists, memoized: refs and search bases repeat across files."""
+    return os.path.exists(path)
+
+
+@lru_cache(maxsize=None)
+def _shared_bases(repo_root):
+    """Subdirectories of shared-references/, listed once per process."""
+    try:
+        with os.scandir(os.path.join(repo_root, "shared-references")) as it:
+            return tuple(entry.path for entry in it if entry.is_dir())
+    except OSError:
+        return ()
+
+
+def _resolves(ref_path, search_bases):
+    """True if ref_path exists under any of search_bases."""
+    # A plain relative path resolves the same with or without normpath,
+    # so skip it; "..", absolute, and trailing-slash refs still need it.
+    plain = not (".." in ref_path or ref_path.startswith("/") or ref_path.endswith("/"))
+    for base in search_bases:
+        if plain:
+            resolved = f"{base}/{ref_path}"
+        else:
+            resolved = os.path.normpath(os.path.join(base, ref_path))
+        if _exists(resolved):
+            return True
+    return False
 
 
 def check_file(filepath, repo_root):
@@ -94,40 +150,31 @@ def check_file(filepath, repo_root):
     search_bases = [skill_dir]
     if repo_root:
         search_bases.append(repo_root)
-        # Add shared-references subdirectories as search bases
-        shared_refs = os.path.join(repo_root, "shared-references")
-        if os.path.isdir(shared_refs):
-            for entry in os.listdir(shared_refs):
-                entry_path = os.path.join(shared_refs, entry)
-                if os.path.isdir(entry_path):
-                    search_bases.append(entry_path)
+        search_bases.extend(_shared_bases(repo_root))
 
     for line_num, ref_path in refs:
-        found = False
-        for base in search_bases:
-            resolved = os.path.normpath(os.path.join(base, ref_path))
-            if os.path.exists(resolved):
-                found = True
-                break
-
-        if not found:
+        if not _resolves(ref_path, search_bases):
             errors.append(
                 f"{rel_path}:{line_num}: broken reference '{ref_path}'"
             )
 
+    # Advisory until enforced: cells the table scan skips
+    for line_num, ref_path in find_table_cell_references(text, refs):
+        if not _resolves(ref_path, search_bases):
+            warnings.append(
+                f"{rel_path}:{line_num}: broken reference '{ref_path}' "
+                f"in a table cell (advisory; not yet enforced)"
+            )
+
     return errors, warnings
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
-
-    repo_root = find_repo_root()
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
     all_errors = []
     all_warnings = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
+    for filepath in resolve_paths(filepaths):
         errors, warnings = check_file(filepath, repo_root)
         all_errors.extend(errors)
         all_warnings.extend(warnings)
@@ -138,7 +185,14 @@ def main():
     for e in all_errors:
         print(f"FAIL: {e}", file=sys.stderr)
 
-    sys.exit(1 if all_errors else 0)
+    return 1 if all_errors else 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
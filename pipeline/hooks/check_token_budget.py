@@ -6,8 +6,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 from _utils import (
-    find_repo_root, load_budgets, classify_file,
-    count_body_words, estimate_tokens, get_budget_limits,
+    find_repo_root, resolve_paths, load_budgets, classify_file,
+    count_text_words, estimate_tokens, get_budget_limits,
     WARN_THRESHOLD,
 )
 
@@ -29,7 +29,7 @@ def check_file(filepath, repo_root, budgets):
         warnings.append(f"{rel_path}: could not read file: {e}")
         return warnings
 
-    word_count = len(text.split())
+    word_count = count_text_words(text)
     token_estimate = estimate_tokens(word_count)
 
     max_words, max_tokens = get_budget_limits(rel_path, classification, budgets)
@@ -57,17 +57,13 @@ def check_file(filepath, repo_root, budgets):
     return warnings
 
 
-def main():
-    if len(sys.argv) < 2:
-        sys.exit(0)
-
-    repo_root = find_repo_root()
+def run(filepaths, repo_root):
+    """Check filepaths, reporting to stderr. Returns the exit status."""
     budgets = load_budgets(repo_root)
 
     all_warnings = []
 
-    for filepath in sys.argv[1:]:
-        filepath = os.path.abspath(filepath)
+    for filepath in resolve_paths(filepaths):
         file_warnings = check_file(filepath, repo_root, budgets)
         all_warnings.extend(file_warnings)
 
@@ -82,7 +78,14 @@ def main():
         )
 
     # Advisory only -- always exit 0
-    sys.exit(0)
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(0)
+
+    sys.exit(run(sys.argv[1:], find_repo_root()))
 
 
 if __name__ == "__main__":
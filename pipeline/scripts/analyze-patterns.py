@@ -4,6 +4,9 @@
 import os
 import re
 import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 # Prohibited prose patterns from the governance spec
 PROHIBITED_PATTERNS = [
@@ -18,50 +21,126 @@ PROHIBITED_PATTERNS = [
     (r"\b[Ww]e can\b", "Conversational: 'we can'"),
 ]
 
-# Compile patterns once
-COMPILED_PATTERNS = [(re.compile(p), desc) for p, desc in PROHIBITED_PATTERNS]
+SKIP_DIRS = frozenset({".git", "node_modules", "pipeline"})
+# Below this many files, worker startup costs more than the work itself
+PARALLEL_MIN_FILES = 32
+
+# All patterns fused into one alternation, compiled once; the named group
+# p<i> identifies which PROHIBITED_PATTERNS entry matched. Every pattern is
+# \b followed by a literal or [Xx] first character, so the shared \b is
+# factored out and a lookahead on the set of first characters rejects most
+# positions with one class test instead of trying every branch. The
+# alternation sits in a lookahead too, so every start position is tried and
+# a match never hides an overlapping one.
+_FIRST_CHARS = "".join(
+    p[3:p.index("]")] if p[2] == "[" else p[2] for p, _ in PROHIBITED_PATTERNS
+)
+PROSE_RE = re.compile(
+    rf"\b(?=[{_FIRST_CHARS}])(?=(?:"
+    + "|".join(f"(?P<p{i}>{p[2:]})" for i, (p, _) in enumerate(PROHIBITED_PATTERNS))
+    + "))"
+)
+DESCS = [desc for _, desc in PROHIBITED_PATTERNS]
+
+# The line boundaries str.splitlines() uses, so offsets agree with the
+# line numbers analyze_lines reports
+LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
 
 
 def find_skill_files(repo_root):
     """Find all SKILL.md files in the repo."""
     results = []
-    for dirpath, dirnames, filenames in os.walk(repo_root):
-        # Skip non-skill directories
-        dirnames[:] = [d for d in dirnames if d not in (".git", "node_modules", "pipeline")]
-        if "SKILL.md" in filenames:
-            results.append(os.path.join(dirpath, "SKILL.md"))
+    stack = [repo_root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    # Skip non-skill directories
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name == "SKILL.md":
+                    results.append(entry.path)
     return sorted(results)
 
 
 def check_prose_patterns(filepath, content):
     """Check for prohibited prose patterns. Returns list of (line_num, pattern_desc)."""
-    findings = []
-    in_code_block = False
-    for i, line in enumerate(content.splitlines(), 1):
-        stripped = line.strip()
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if in_code_block:
+    # Scan the whole document once; no pattern spans a line break. Clean
+    # files (the common case) return here without building the line index.
+    matches = list(PROSE_RE.finditer(content))
+    if not matches:
+        return []
+
+    line_starts = [0]
+    line_ends = []
+    for m in LINE_BREAK_RE.finditer(content):
+        line_ends.append(m.start())
+        line_starts.append(m.end())
+    line_ends.append(len(content))
+
+    # Fence lines: ``` after optional whitespace. Jump between ``` occurrences
+    # with str.find; any later ``` on the same line is not at its start.
+    fences = []
+    i = content.find("```")
+    while i != -1:
+        k = bisect_right(line_starts, i) - 1
+        if line_starts[k] == i or content[line_starts[k]:i].isspace():
+            fences.append(k)
+        i = content.find("```", line_ends[k])
+
+    # A line is inside a code block when an odd number of fence lines
+    # precede it, and fence lines themselves are skipped.
+    hits = set()
+    for m in matches:
+        line_idx = bisect_right(line_starts, m.start()) - 1
+        k = bisect_left(fences, line_idx)
+        if k % 2 or (k < len(fences) and fences[k] == line_idx):
             continue
-        # Skip frontmatter
-        if stripped == "---" and i <= 5:
-            continue
-        for pattern, desc in COMPILED_PATTERNS:
-            if pattern.search(line):
-                findings.append((i, desc, line.strip()))
+        hits.add((line_idx, int(m.lastgroup[1:])))
+
+    findings = []
+    for line_idx, i in sorted(hits):
+        line = content[line_starts[line_idx]:line_ends[line_idx]]
+        findings.append((line_idx + 1, DESCS[i], line.strip()))
     return findings
 
 
-def check_output_duplication(filepath, content):
-    """Detect schema + example duplication for the same output format."""
-    findings = []
-    lines = content.splitlines()
+def analyze_lines(filepath, lines):
+    """Detect output format duplication and long checklists in one pass.
+
+    Returns (duplication, checklists), each a list of (line_num, desc).
+    """
+    duplication = []
+    checklists = []
     has_schema_section = False
     has_example_section = False
     in_output_section = False
+    run_start = None
+    run_count = 0
 
     for i, line in enumerate(lines, 1):
+        # Inline checklist runs: consecutive "- " items ("- [ ]" included)
+        if "- " in line and line.strip().startswith("- "):
+            if run_start is None:
+                run_start = i
+            run_count += 1
+        elif run_start is not None:
+            if run_count > 10:
+                checklists.append(
+                    (run_start, f"Inline checklist with {run_count} items (>10 — extract to reference file)")
+                )
+            run_start = None
+            run_count = 0
+
+        # Schema + example duplication. Outside an output section only a
+        # header can change state.
+        if not in_output_section and "#" not in line:
+            continue
+
         stripped = line.strip().lower()
         # Detect output-related headers
         if stripped.startswith("#") and any(
@@ -84,45 +163,18 @@ def check_output_duplication(filepath, content):
                 has_example_section = True
 
             if has_schema_section and has_example_section:
-                findings.append(
+                duplication.append(
                     (i, "Output format has both schema description and example (keep only example)")
                 )
                 in_output_section = False
 
-    return findings
-
-
-def check_long_checklists(filepath, content):
-    """Detect inline checklists with >10 items."""
-    findings = []
-    lines = content.splitlines()
-    run_start = None
-    run_count = 0
-
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        is_checklist = stripped.startswith("- [ ]") or stripped.startswith("- [x]")
-        is_list_item = stripped.startswith("- ") and not is_checklist
-
-        if is_checklist or is_list_item:
-            if run_start is None:
-                run_start = i
-            run_count += 1
-        else:
-            if run_count > 10:
-                findings.append(
-                    (run_start, f"Inline checklist with {run_count} items (>10 — extract to reference file)")
-                )
-            run_start = None
-            run_count = 0
-
     # Handle trailing run
-    if run_count > 10 and run_start is not None:
-        findings.append(
+    if run_count > 10:
+        checklists.append(
             (run_start, f"Inline checklist with {run_count} items (>10 — extract to reference file)")
         )
 
-    return findings
+    return duplication, checklists
 
 
 def analyze_file(filepath, repo_root):
@@ -134,17 +186,26 @@ def analyze_file(filepath, repo_root):
     except (OSError, UnicodeDecodeError) as e:
         return {"path": rel_path, "error": str(e)}
 
+    duplication, checklists = analyze_lines(filepath, content.splitlines())
     return {
         "path": rel_path,
         "prose": check_prose_patterns(filepath, content),
-        "duplication": check_output_duplication(filepath, content),
-        "checklists": check_long_checklists(filepath, content),
+        "duplication": duplication,
+        "checklists": checklists,
     }
 
 
+def map_files(fn, files):
+    """Apply fn to each file in order, across processes for large batches."""
+    if len(files) < PARALLEL_MIN_FILES:
+        return [fn(f) for f in files]
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(fn, files, chunksize=8))
+
+
 def generate_report(results):
     """Generate a markdown report from analysis results."""
-    lines = ["# Pattern Analysis Report", ""]
+    lines = []
 
     total_prose = 0
     total_duplication = 0
@@ -195,17 +256,21 @@ def generate_report(results):
                 lines.append(f"- Line {line_num}: {desc}")
             lines.append("")
 
-    # Summary
-    lines.insert(2, "## Summary")
-    lines.insert(3, "")
-    lines.insert(4, f"| Category | Findings |")
-    lines.insert(5, f"|----------|----------|")
-    lines.insert(6, f"| Prohibited prose patterns | {total_prose} |")
-    lines.insert(7, f"| Output format duplication | {total_duplication} |")
-    lines.insert(8, f"| Long inline checklists | {total_checklists} |")
-    lines.insert(9, "")
+    # Summary goes first; totals are only known once the body is built
+    header = [
+        "# Pattern Analysis Report",
+        "",
+        "## Summary",
+        "",
+        "| Category | Findings |",
+        "|----------|----------|",
+        f"| Prohibited prose patterns | {total_prose} |",
+        f"| Output format duplication | {total_duplication} |",
+        f"| Long inline checklists | {total_checklists} |",
+        "",
+    ]
 
-    return "\n".join(lines)
+    return "\n".join(header + lines)
 
 
 def main():
@@ -221,7 +286,7 @@ def main():
         print("# Pattern Analysis Report\n\nNo SKILL.md files found.")
         return
 
-    results = [analyze_file(f, repo_root) for f in files]
+    results = map_files(partial(analyze_file, repo_root=repo_root), files)
     report = generate_report(results)
     print(report)
 
@@ -5,11 +5,27 @@ import json
 import math
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
 TOKEN_RATIO = 1.33
+# Below this many files, worker startup costs more than the work itself
+PARALLEL_MIN_FILES = 32
+SKIP_DIRS = frozenset({".git", "node_modules"})
+CLASSIFICATIONS = ("coordinator", "specialist", "standalone", "reference")
+# Maps ASCII whitespace (the str.split() set) to b" " and everything else to
+# b"x", so words can be counted as " x" transitions at C speed.
+_WORD_MARKS = bytes(
+    0x20 if b in b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f" else 0x78 for b in range(256)
+)
 
 
 def find_repo_root(start):
+    # A wrapper that already knows the root can skip the walk
+    env_root = os.environ.get("SKILL_GOV_ROOT")
+    if env_root and os.path.isdir(os.path.join(env_root, "pipeline", "config")):
+        return os.path.abspath(env_root)
+
     d = os.path.abspath(start)
     while True:
         if os.path.isdir(os.path.join(d, "pipeline", "config")):
@@ -26,6 +42,7 @@ def load_budgets(repo_root):
         return json.load(f)
 
 
+@lru_cache(maxsize=None)
 def classify_file(filepath, repo_root):
     """Classify a file as coordinator, specialist, reference, standalone, or skip."""
     rel = os.path.relpath(filepath, repo_root).replace("\\", "/")
@@ -50,108 +67,147 @@ def classify_file(filepath, repo_root):
     return "standalone"
 
 
-def get_budget_limits(rel_path, classification, budgets):
+def build_limits_index(budgets):
+    """Map each classification to its default (max_words, max_tokens)."""
+    return {
+        cls: (budgets.get(cls + "_max_words"), budgets.get(cls + "_max_tokens"))
+        for cls in CLASSIFICATIONS
+    }
+
+
+def get_budget_limits(rel_path, classification, budgets, limits):
     overrides = budgets.get("overrides", {})
     normalized = rel_path.replace("\\", "/")
 
     if normalized in overrides:
         override = overrides[normalized]
         word_key = classification + "_max_words"
-        token_key = classification + "_max_tokens"
         if word_key in override:
-            return override[word_key], override[token_key]
+            return override[word_key], override[classification + "_max_tokens"]
+
+    return limits.get(classification, (None, None))
 
-    word_key = classification + "_max_words"
-    token_key = classification + "_max_tokens"
-    return budgets.get(word_key), budgets.get(token_key)
+
+def count_words(text):
+    """Count words in text, equal to len(text.split()) but list-free."""
+    if text.isascii():
+        marks = text.encode("ascii").translate(_WORD_MARKS)
+        return marks.count(b" x") + marks.startswith(b"x")
+    return len(text.split())
 
 
 def find_all_files(repo_root):
     """Find all SKILL.md, references/*.md, and shared-references/**/*.md files."""
     results = []
+    prefix_len = len(os.path.join(repo_root, ""))
+    # The pipeline/ tree holds tooling and templates; only its
+    # shared-references directories are budgeted
+    pipeline_dir = os.path.join(repo_root, "pipeline")
+    pipeline_prefix = os.path.join(pipeline_dir, "")
+    stack = [repo_root]
+
+    while stack:
+        dirpath = stack.pop()
+        in_pipeline = dirpath == pipeline_dir or dirpath.startswith(pipeline_prefix)
+        skip_files = in_pipeline and "shared-references" not in dirpath[prefix_len:]
+        try:
+            it = os.scandir(dirpath)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                    continue
+                if skip_files:
+                    continue
+
+                fn = entry.name
+                # Include SKILL.md files
+                if fn == "SKILL.md":
+                    results.append(entry.path)
+                # Include reference files
+                elif fn.endswith(".md"):
+                    rel = entry.path[prefix_len:].replace("\\", "/")
+                    if "references/" in rel or "shared-references/" in rel:
+                        results.append(entry.path)
 
-    for dirpath, dirnames, filenames in os.walk(repo_root):
-        dirnames[:] = [d for d in dirnames if d not in (".git", "node_modules")]
-        rel_dir = os.path.relpath(dirpath, repo_root)
+    return sorted(results)
 
-        # Skip pipeline directory itself (but not its contents we need)
-        if rel_dir.startswith("pipeline") and "shared-references" not in rel_dir:
-            continue
 
-        for fn in filenames:
-            filepath = os.path.join(dirpath, fn)
-            rel = os.path.relpath(filepath, repo_root).replace("\\", "/")
+def measure_file(filepath, repo_root, budgets, limits):
+    """Build the report row for one file, or None if it isn't budgeted."""
+    rel_path = os.path.relpath(filepath, repo_root).replace("\\", "/")
+    classification = classify_file(filepath, repo_root)
 
-            # Include SKILL.md files
-            if fn == "SKILL.md":
-                results.append(filepath)
-            # Include reference files
-            elif fn.endswith(".md") and ("references/" in rel or "shared-references/" in rel):
-                results.append(filepath)
+    if classification == "skip":
+        return None
 
-    return sorted(results)
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return {
+            "path": rel_path,
+            "words": 0,
+            "tokens": 0,
+            "limit": "N/A",
+            "status": "ERROR",
+            "headroom": "N/A",
+            "classification": classification,
+        }
 
+    words = count_words(text)
+    tokens = int(math.ceil(words * TOKEN_RATIO))
+    max_words, max_tokens = get_budget_limits(rel_path, classification, budgets, limits)
 
-def generate_report(files, repo_root, budgets):
-    rows = []
+    if max_tokens is None:
+        return {
+            "path": rel_path,
+            "words": words,
+            "tokens": tokens,
+            "limit": "N/A",
+            "status": "SKIP",
+            "headroom": "N/A",
+            "classification": classification,
+        }
 
-    for filepath in files:
-        rel_path = os.path.relpath(filepath, repo_root).replace("\\", "/")
-        classification = classify_file(filepath, repo_root)
+    ratio = tokens / max_tokens if max_tokens > 0 else 0
+    headroom = max_tokens - tokens
 
-        if classification == "skip":
-            continue
+    if ratio > 1.0:
+        status = "OVER"
+    elif ratio > 0.90:
+        status = "WARN"
+    else:
+        status = "OK"
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                text = f.read()
-        except (OSError, UnicodeDecodeError):
-            rows.append({
-                "path": rel_path,
-                "words": 0,
-                "tokens": 0,
-                "limit": "N/A",
-                "status": "ERROR",
-                "headroom": "N/A",
-                "classification": classification,
-            })
-            continue
+    return {
+        "path": rel_path,
+        "words": words,
+        "tokens": tokens,
+        "limit": max_tokens,
+        "status": status,
+        "headroom": headroom,
+        "classification": classification,
+    }
 
-        words = len(text.split())
-        tokens = int(math.ceil(words * TOKEN_RATIO))
-        max_words, max_tokens = get_budget_limits(rel_path, classification, budgets)
-
-        if max_tokens is None:
-            rows.append({
-                "path": rel_path,
-                "words": words,
-                "tokens": tokens,
-                "limit": "N/A",
-                "status": "SKIP",
-                "headroom": "N/A",
-                "classification": classification,
-            })
-            continue
 
-        ratio = tokens / max_tokens if max_tokens > 0 else 0
-        headroom = max_tokens - tokens
+def map_files(fn, files):
+    """Apply fn to each file in order, across processes for large batches."""
+    if len(files) < PARALLEL_MIN_FILES:
+        return [fn(f) for f in files]
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(fn, files, chunksize=8))
 
-        if ratio > 1.0:
-            status = "OVER"
-        elif ratio > 0.90:
-            status = "WARN"
-        else:
-            status = "OK"
 
-        rows.append({
-            "path": rel_path,
-            "words": words,
-            "tokens": tokens,
-            "limit": max_tokens,
-            "status": status,
-            "headroom": headroom,
-            "classification": classification,
-        })
+def generate_report(files, repo_root, budgets):
+    measure = partial(
+        measure_file, repo_root=repo_root, budgets=budgets, limits=build_limits_index(budgets)
+    )
+    measured = map_files(measure, files)
+    rows = [row for row in measured if row is not None]
 
     # Generate markdown table
     lines = [
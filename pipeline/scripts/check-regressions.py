@@ -5,8 +5,19 @@ import json
 import os
 import sys
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 def find_repo_root(start):
+    # A wrapper that already knows the root can skip the walk
+    env_root = os.environ.get("SKILL_GOV_ROOT")
+    if env_root and os.path.isdir(os.path.join(env_root, "pipeline", "config")):
+        return os.path.abspath(env_root)
+
     d = os.path.abspath(start)
     while True:
         if os.path.isdir(os.path.join(d, "pipeline", "config")):
@@ -18,21 +29,33 @@ def find_repo_root(start):
 
 
 def find_skill_dirs(repo_root):
-    results = []
-    for entry in sorted(os.listdir(repo_root)):
-        if entry.endswith("-skill") and os.path.isdir(os.path.join(repo_root, entry)):
-            results.append(os.path.join(repo_root, entry))
+    with os.scandir(repo_root) as it:
+        results = [e.path for e in it if e.name.endswith("-skill") and e.is_dir()]
+    results.sort()
     return results
 
 
 def load_json(filepath):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
     try:
+        if HAS_ORJSON:
+            with open(filepath, "rb") as f:
+                return orjson.loads(f.read())
         with open(filepath, "r", encoding="utf-8") as f:
             return json.load(f)
     except (OSError, json.JSONDecodeError, UnicodeDecodeError):
         return None
 
 
+def _list_json(directory):
+    """Return the set of *.json names in directory, or an empty set if unreadable."""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if e.name.endswith(".json")}
+    except OSError:
+        return set()
+
+
 def check_skill_regressions(skill_dir, results_dir):
     """Check a single skill for regressions. Returns list of regression descriptions."""
     skill_name = os.path.basename(skill_dir)
@@ -41,29 +64,26 @@ def check_skill_regressions(skill_dir, results_dir):
 
     regressions = []
 
-    # Skip if no baselines exist
-    if not os.path.isdir(baselines_dir):
+    # One listing per directory; skip if either is missing
+    baseline_names = _list_json(baselines_dir)
+    if not baseline_names:
         return regressions
-
-    # Skip if no results exist
-    if not os.path.isdir(skill_results_dir):
+    result_names = _list_json(skill_results_dir)
+    if not result_names:
         return regressions
 
     # Compare each baseline against results
-    for entry in sorted(os.listdir(baselines_dir)):
-        if not entry.endswith(".json"):
+    for entry in sorted(baseline_names):
+        # No result for this baseline — skip (not a regression)
+        if entry not in result_names:
             continue
 
-        baseline_path = os.path.join(baselines_dir, entry)
-        result_path = os.path.join(skill_results_dir, entry)
-
-        baseline = load_json(baseline_path)
+        baseline = load_json(os.path.join(baselines_dir, entry))
         if baseline is None:
             continue
 
-        result = load_json(result_path)
+        result = load_json(os.path.join(skill_results_dir, entry))
         if result is None:
-            # No result for this baseline — skip (not a regression)
             continue
 
         # Compare pass/fail status
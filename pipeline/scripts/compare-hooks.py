@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""compare-hooks.py — Run the hooks from a base git ref and from the working tree on the same files and diff their output.
+
+Usage: compare-hooks.py [BASE_REF] [TREE]
+
+BASE_REF defaults to HEAD, so uncommitted hook changes are compared against
+the last commit. TREE is a skill repo (with pipeline/config/) to check;
+without it a built-in fixture tree covering known edge cases is used. Each
+hook is run once with every markdown file and once per file, since some
+hooks (check_context_load) decide what to check from the files passed in.
+The working tree's _runner.py is also checked against its hooks run one by
+one. Exits 1 if any output differs; a deliberate behaviour change shows up
+here and belongs in the PR description.
+"""
+
+import difflib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Same order as _runner.HOOKS, so the concatenated output is comparable
+FILE_HOOKS = (
+    "check_frontmatter",
+    "check_references",
+    "check_isolation",
+    "check_context_load",
+    "check_token_budget",
+    "check_prose",
+)
+COMMIT_MESSAGES = (
+    "skill(alpha): add the alpha suite",
+    "skill-fix(beta): correct a broken reference",
+    "bogus(beta): unknown type",
+    "bad message",
+    "chore(pipeline): short.",
+    "Merge branch 'main' into feature",
+)
+
+
+def _words(n):
+    return " ".join(["word"] * n) + "\n"
+
+
+# Path -> content. Each entry exercises something a hook change has broken
+# before or that the hooks treat specially.
+FIXTURE = {
+    # Coordinator over its budget; with specialist one it exceeds the
+    # simultaneous ceiling, so the per-file runs show which files trigger it
+    "alpha-skill/SKILL.md": (
+        "---\n"
+        "name: alpha-skill\n"
+        "description: A coordinator skill that routes requests to specialists in the suite\n"
+        "---\n"
+        "# Alpha\n\n"
+        "## Procedure\n"
+        "You should route. It is important to check `skills/one/SKILL.md`.\n"
+        "Basically do it. In order to win, keep in mind that we can.\n"
+        + _words(3000)
+    ),
+    "alpha-skill/skills/one/SKILL.md": (
+        "---\n"
+        "name: one\n"
+        "description: The first specialist in the alpha suite which does one thing very well\n"
+        "model:\n"
+        "  preferred: unknown\n"
+        "---\n"
+        "# One\n"
+        "See ../two/SKILL.md and `references/a.md` and `references/missing.md`.\n"
+        # Backtick spans pair up left to right: references/ghost.md is not a
+        # reference, it follows the closing backtick of references/a.md
+        "Read `references/a.md`references/ghost.md` and `git` then `references/b.md`\n"
+        "| `references/b.md` | `references/gone.md` |\n"
+        "| references/nope.md | table |\n"
+        # Adjacent cells share a pipe; only the first was ever checked
+        "| docs/b.md | docs/cell.md |\n"
+        "Bare references/a.md and shared-references/common/foo.md\n"
+        "`https://example.com/a/` and `not a path/`\n"
+        "```\n"
+        "You should ignore this in code\n"
+        "```\n"
+        "## Output\n"
+    ),
+    "alpha-skill/skills/one/references/a.md": _words(1200),
+    "alpha-skill/skills/one/references/b.md": _words(50),
+    # Bad name, short description, unknown hook event; imports a sibling
+    "alpha-skill/skills/two/SKILL.md": (
+        "---\n"
+        "name: Two_Bad\n"
+        "description: short\n"
+        "hooks:\n"
+        "  - event: Bogus\n"
+        "---\n"
+        "# Two\n"
+        "Read ../one/references/a.md first. We should do it; feel free to.\n"
+    ),
+    "alpha-skill/skills/two/references/c.md": _words(10),
+    "beta-skill/SKILL.md": (
+        "---\n"
+        "name: beta-skill\n"
+        "description: A standalone skill that is used for testing the governance pipeline hooks\n"
+        "depends_on: [Bad_Dep, good-dep]\n"
+        "distribution: elsewhere\n"
+        "---\n"
+        "# Beta\n"
+        "It is important to test. This is because. Essentially fine.\n"
+        # Lines split by splitlines() boundaries other than \n
+        "Note that you should\x0cjust do it.\x85Simply put.\r\n"
+        "See references/x.md and references/sub/y.md and references/sub/\n"
+        + _words(1400)
+    ),
+    "beta-skill/references/x.md": _words(1050),
+    "beta-skill/references/sub/y.md": _words(5),
+    "shared-references/common/foo.md": _words(20),
+    "gamma-skill/SKILL.md": "no frontmatter\n",
+    "delta-skill/SKILL.md": "---\nname: delta\ndescription: unclosed\n",
+    "empty-skill/SKILL.md": "",
+    "templates/SKILL.md": "---\nname: Not_Checked\n---\n",
+}
+
+
+def find_repo_root(start):
+    # A wrapper that already knows the root can skip the walk
+    env_root = os.environ.get("SKILL_GOV_ROOT")
+    if env_root and os.path.isdir(os.path.join(env_root, "pipeline", "config")):
+        return os.path.abspath(env_root)
+
+    d = os.path.abspath(start)
+    while True:
+        if os.path.isdir(os.path.join(d, "pipeline", "config")):
+            return d
+        parent = os.path.dirname(d)
+        if parent == d:
+            return None
+        d = parent
+
+
+def _git(args, cwd, **kwargs):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, **kwargs)
+
+
+def extract_hooks(repo_root, ref, dest):
+    """Write pipeline/hooks as of ref under dest. Returns the hooks directory."""
+    archive = _git(
+        ["archive", "--format=tar", ref, "pipeline/hooks"],
+        repo_root, capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        # The "data" filter (Python 3.12+, backported) refuses unsafe members
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+    return os.path.join(dest, "pipeline", "hooks")
+
+
+def build_fixture(repo_root, dest):
+    """Write FIXTURE plus this repo's pipeline/config into a fresh git repo."""
+    for rel_path, content in FIXTURE.items():
+        path = os.path.join(dest, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+    shutil.copytree(
+        os.path.join(repo_root, "pipeline", "config"),
+        os.path.join(dest, "pipeline", "config"),
+    )
+    # The hooks find the repo root through git
+    _git(["init", "-q"], dest)
+    _git(["add", "-A"], dest)
+
+
+def list_markdown(tree):
+    """Tracked markdown files outside pipeline/, relative to tree."""
+    out = _git(["ls-files", "-z", "*.md"], tree, capture_output=True).stdout
+    return sorted(
+        p for p in out.decode("utf-8").split("\0")
+        if p and not p.startswith("pipeline/")
+    )
+
+
+def run_hook(hooks_dir, name, args, tree):
+    """Run one hook. Returns its combined output and exit status as text."""
+    result = subprocess.run(
+        [sys.executable, os.path.join(hooks_dir, f"{name}.py"), *args],
+        cwd=tree,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    return result.stdout.decode("utf-8", "replace"), result.returncode
+
+
+def build_jobs(files, msg_dir):
+    """Return [(label, hook, args), ...] for every comparison to run."""
+    jobs = []
+    for name in FILE_HOOKS:
+        jobs.append((f"{name} <all files>", name, files))
+        jobs.extend((f"{name} {f}", name, [f]) for f in files)
+    for i, message in enumerate(COMMIT_MESSAGES):
+        path = os.path.join(msg_dir, f"msg{i}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(message + "\n")
+        jobs.append((f"check_commit_msg {message!r}", "check_commit_msg", [path]))
+    return jobs
+
+
+def diff_outputs(label, old, new, old_name, new_name):
+    """Unified diff of two (output, status) pairs; empty when they agree."""
+    if old == new:
+        return ""
+    a = old[0].splitlines(keepends=True) + [f"exit={old[1]}\n"]
+    b = new[0].splitlines(keepends=True) + [f"exit={new[1]}\n"]
+    body = "".join(difflib.unified_diff(a, b, old_name, new_name))
+    return f"### {label}\n{body}"
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    repo_root = find_repo_root(script_dir)
+    if repo_root is None:
+        print("ERROR: could not find repo root", file=sys.stderr)
+        sys.exit(1)
+
+    base_ref = sys.argv[1] if len(sys.argv) > 1 else "HEAD"
+    new_hooks = os.path.join(repo_root, "pipeline", "hooks")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            old_hooks = extract_hooks(repo_root, base_ref, os.path.join(tmp, "base"))
+        except subprocess.CalledProcessError:
+            print(f"ERROR: could not read pipeline/hooks at '{base_ref}'", file=sys.stderr)
+            sys.exit(1)
+
+        if len(sys.argv) > 2:
+            tree = os.path.abspath(sys.argv[2])
+            if not os.path.isdir(os.path.join(tree, "pipeline", "config")):
+                print(f"ERROR: {tree} has no pipeline/config/", file=sys.stderr)
+                sys.exit(1)
+        else:
+            tree = os.path.join(tmp, "tree")
+            build_fixture(repo_root, tree)
+
+        files = list_markdown(tree)
+        msg_dir = os.path.join(tmp, "messages")
+        os.makedirs(msg_dir)
+        jobs = build_jobs(files, msg_dir)
+
+        # Hooks are independent subprocesses; run both versions side by side
+        with ThreadPoolExecutor() as pool:
+            olds = pool.map(lambda job: run_hook(old_hooks, job[1], job[2], tree), jobs)
+            news = pool.map(lambda job: run_hook(new_hooks, job[1], job[2], tree), jobs)
+            diffs = [
+                diff_outputs(label, old, new, base_ref, "working tree")
+                for (label, _, _), old, new in zip(jobs, olds, news)
+            ]
+
+            # _runner.py must print what its hooks print when run one by one
+            if os.path.isfile(os.path.join(new_hooks, "_runner.py")):
+                singles = [run_hook(new_hooks, name, files, tree) for name in FILE_HOOKS]
+                combined = (
+                    "".join(out for out, _ in singles),
+                    max(status for _, status in singles),
+                )
+                diffs.append(diff_outputs(
+                    "_runner.py all <all files>", combined,
+                    run_hook(new_hooks, "_runner", ["all", *files], tree),
+                    "hooks one by one", "_runner.py all",
+                ))
+
+    diffs = [d for d in diffs if d]
+    for d in diffs:
+        print(d)
+    print(f"{len(jobs)} hook runs compared against {base_ref}: {len(diffs)} differ")
+    sys.exit(1 if diffs else 0)
+
+
+if __name__ == "__main__":
+    main()
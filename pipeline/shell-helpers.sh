@@ -93,15 +93,15 @@ skill-audit() {
     echo "=== Skill Compliance Audit ==="
     echo ""
     echo "--- Hard Checks (structural integrity) ---"
-    pre-commit run skill-frontmatter --all-files
-    pre-commit run skill-references --all-files
-    pre-commit run skill-isolation --all-files
-    pre-commit run skill-context-load --all-files
+    pre-commit run skill-frontmatter --hook-stage manual --all-files
+    pre-commit run skill-references --hook-stage manual --all-files
+    pre-commit run skill-isolation --hook-stage manual --all-files
+    pre-commit run skill-context-load --hook-stage manual --all-files
     local hard_status=$?
     echo ""
     echo "--- Advisory Checks (quality guidance) ---"
-    pre-commit run skill-token-budget --all-files
-    pre-commit run skill-prose-check --all-files
+    pre-commit run skill-token-budget --hook-stage manual --all-files
+    pre-commit run skill-prose-check --hook-stage manual --all-files
     echo ""
     echo "=== Budget Report ==="
     python3 pipeline/scripts/budget-report.py